@@ -9,6 +9,14 @@ class Config:
         llm_texts_url: List of llms.txt URLs to index for documentation
         timeout: HTTP request timeout in seconds
         user_agent: User agent string for HTTP requests
+        cache_dir: Directory for the persistent page cache (revalidated with ETag/Last-Modified)
+        cache_max_entries: Maximum number of pages kept in the persistent cache
+        cache_max_age: Seconds after which a persistent cache entry is pruned
+        page_cache_size: Maximum number of pages kept in memory
+        page_cache_ttl: Seconds a page stays in memory before it is revalidated
+        max_response_bytes: Maximum number of bytes read from a single HTTP response
+        max_concurrent_requests: Maximum number of HTTP requests in flight across all hosts
+        max_requests_per_host: Maximum number of HTTP requests in flight to a single host
     """
 
     llm_texts_url: list[str] = field(
@@ -16,6 +24,14 @@ class Config:
     )  # Curated list of llms.txt files to index at startup
     timeout: float = 30.0  # HTTP request timeout in seconds
     user_agent: str = "strands-mcp-docs/1.0"  # User agent for HTTP requests
+    cache_dir: str = "~/.cache/strands-mcp"  # Persistent page cache location
+    cache_max_entries: int = 2048  # Oldest entries are pruned beyond this count
+    cache_max_age: float = 30 * 24 * 3600.0  # Entries not rewritten for 30 days are pruned
+    page_cache_size: int = 256  # Max pages held in memory (least recently used evicted first)
+    page_cache_ttl: float = 3600.0  # In-memory page lifetime in seconds
+    max_response_bytes: int = 2 * 1024 * 1024  # Responses are truncated beyond this size
+    max_concurrent_requests: int = 10  # Global cap on in-flight HTTP requests
+    max_requests_per_host: int = 2  # Per-host cap, keeps parallel fetches under CDN rate limits
 
 
 # Global configuration instance
@@ -2,7 +2,7 @@ from typing import Any, Dict, List
 
 from mcp.server.fastmcp import FastMCP
 
-from .utils import cache, text_processor
+from .utils import cache, indexer
 
 APP_NAME = "strands-agents-mcp-server"
 mcp = FastMCP(APP_NAME)
@@ -40,37 +40,40 @@ def search_docs(query: str, k: int = 5) -> List[Dict[str, Any]]:
         List of dictionaries containing:
         - url: Document URL
         - title: Display title
-        - score: Relevance score (0-1, higher is better)
+        - score: Relative ranking score from rank fusion (higher is better; only
+          meaningful for ordering the results of a single query)
         - snippet: Contextual content preview
 
     """
     cache.ensure_ready()
     index = cache.get_index()
-    results = index.search(query, k=k) if index else []
+    bm25 = cache.get_bm25()
+    # Rank with the Markdown-aware TF-IDF index and plain BM25, then fuse both rankings
+    depth = max(k, cache.FUSION_DEPTH)
+    tfidf_results = index.search(query, k=depth) if index else []
+    bm25_results = bm25.search(query, k=depth) if bm25 else []
+    results = indexer.fuse_rankings(tfidf_results, bm25_results, k=k)
     url_cache = cache.get_url_cache()
 
-    # Collect top-k URLs that need hydration (no content yet)
-    # Simplified: Direct hydration in one pass
-    top = results[: min(len(results), cache.SNIPPET_HYDRATE_MAX)]
-    for _, doc in top:
-        cached = url_cache.get(doc.uri)
+    # Collect top-k URLs that need hydration (no content yet), once each, and fetch them concurrently
+    top_uris = dict.fromkeys(doc.uri for _, doc in results[: cache.SNIPPET_HYDRATE_MAX])
+    pending: List[str] = []
+    for uri in top_uris:
+        cached = url_cache.get(uri)
         if cached is None or not cached.content:
-            cache.ensure_page(doc.uri)
+            pending.append(uri)
+    cache.ensure_pages(pending)
 
     # Build response with real content snippets when available
-    return_docs: List[Dict[str, Any]] = []
-    for score, doc in results:
-        page = url_cache.get(doc.uri)
-        snippet = text_processor.make_snippet(page, doc.display_title)
-        return_docs.append(
-            {
-                "url": doc.uri,
-                "title": doc.display_title,
-                "score": round(score, 3),
-                "snippet": snippet,
-            }
-        )
-    return return_docs
+    return [
+        {
+            "url": doc.uri,
+            "title": doc.display_title,
+            "score": score,
+            "snippet": cache.get_snippet(doc.uri, doc.display_title),
+        }
+        for score, doc in results
+    ]
 
 
 @mcp.tool()
@@ -1,46 +1,172 @@
-from typing import Dict
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 
 from ..config import doc_config
 from . import doc_fetcher, indexer, text_processor
 
+
+class PageCache:
+    """Thread-safe in-memory page cache with LRU eviction and per-entry expiry.
+
+    Keeps memory bounded on long-running servers. Expired pages are dropped on
+    access, so the next fetch revalidates them against the persistent cache.
+    Each entry can also hold the page's search snippet, which leaves the cache
+    together with the page.
+
+    Attributes:
+        maxsize: Maximum number of pages held
+        ttl: Seconds a page stays valid after it is stored
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize an empty page cache.
+
+        Args:
+            maxsize: Maximum number of pages held
+            ttl: Seconds a page stays valid after it is stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # url -> [expiry, page, (display title, snippet) or None]
+        self._entries: OrderedDict[str, List[Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> doc_fetcher.Page | None:
+        """Get a cached page, marking it as recently used.
+
+        Args:
+            url: The URL of the page
+
+        Returns:
+            The cached Page, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            expires, page, _ = entry
+            if expires <= time.monotonic():
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            return page
+
+    def set(self, url: str, page: doc_fetcher.Page) -> None:
+        """Store a page, evicting the least recently used pages when full.
+
+        Args:
+            url: The URL of the page
+            page: The page to store
+        """
+        with self._lock:
+            self._entries[url] = [time.monotonic() + self.ttl, page, None]
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_snippet(self, url: str, display_title: str) -> str | None:
+        """Get the snippet memoized for a cached page.
+
+        Args:
+            url: The URL of the page
+            display_title: Title the snippet must have been built with
+
+        Returns:
+            The memoized snippet, or None if there is none for this title
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            memo = entry[2] if entry is not None else None
+            if memo is None or memo[0] != display_title:
+                return None
+            return memo[1]
+
+    def set_snippet(self, url: str, page: doc_fetcher.Page, display_title: str, snippet: str) -> None:
+        """Memoize the snippet of a cached page.
+
+        Ignored if the entry no longer holds the page the snippet was built from.
+
+        Args:
+            url: The URL of the page
+            page: The page the snippet was built from
+            display_title: Title the snippet was built with
+            snippet: The snippet text
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and entry[1] is page:
+                entry[2] = (display_title, snippet)
+
+    def pop(self, url: str) -> None:
+        """Remove a page from the cache, if present.
+
+        Args:
+            url: The URL of the page
+        """
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def __len__(self) -> int:
+        """Return the number of cached pages, including not yet evicted expired ones."""
+        return len(self._entries)
+
+
 # Global state
 _INDEX: indexer.IndexSearch | None = None
-_URL_CACHE: Dict[str, doc_fetcher.Page | None] = {}  # url -> Page (None if not fetched yet)
+_BM25: indexer.BM25Index | None = None
+_URL_CACHE = PageCache(doc_config.page_cache_size, doc_config.page_cache_ttl)  # url -> fetched Page
 _URL_TITLES: Dict[str, str] = {}  # url -> curated title from llms.txt
 _LINKS_LOADED = False
+_PAGE_LOCK_STRIPES = 64  # fixed number of hydration locks, so lock memory does not grow with URLs seen
+_PAGE_LOCKS = tuple(threading.Lock() for _ in range(_PAGE_LOCK_STRIPES))  # url hash -> hydration lock
+_BM25_LOCK = threading.Lock()  # serializes BM25 updates from concurrent hydrators
 
 SNIPPET_HYDRATE_MAX = 5  # how many top results to hydrate with content
+HYDRATE_WORKERS_MAX = 6  # max concurrent page fetches when hydrating several pages
+PREFETCH_CONCURRENCY = 8  # max llms.txt catalogs downloaded at once during startup
+FUSION_DEPTH = 50  # candidates taken from each ranker before rank fusion
 
 
 def load_links_only() -> None:
     """Parse llms.txt files and index curated titles without fetching content.
 
     This function initializes the search index with document titles and URLs from
-    configured llms.txt files. Content is not fetched during initialization for
-    faster startup times.
+    configured llms.txt files. The catalogs are downloaded concurrently; page
+    content is not fetched during initialization for faster startup times.
 
     Side Effects:
-        - Updates global _INDEX with document entries
+        - Updates global _INDEX and _BM25 with document entries
         - Populates _URL_TITLES with curated titles
-        - Sets placeholder entries in _URL_CACHE
         - Sets _LINKS_LOADED to True
     """
-    global _INDEX, _LINKS_LOADED, _URL_TITLES, _URL_CACHE
+    global _INDEX, _BM25, _LINKS_LOADED, _URL_TITLES
     if _INDEX is None:
         _INDEX = indexer.IndexSearch()
+    if _BM25 is None:
+        _BM25 = indexer.BM25Index()
+
+    # Download all catalogs concurrently; index them in configured order afterwards
+    sources = doc_config.llm_texts_url
+    with ThreadPoolExecutor(max_workers=max(1, min(PREFETCH_CONCURRENCY, len(sources)))) as executor:
+        catalogs = list(executor.map(doc_fetcher.parse_llms_txt, sources))
 
-    for src in doc_config.llm_texts_url:
-        for title, url in doc_fetcher.parse_llms_txt(src):
-            # Record curated display title and placeholder cache
+    for titles, urls in catalogs:
+        for title, url in zip(titles, urls, strict=True):
+            # Record curated display title
             _URL_TITLES[url] = title
-            _URL_CACHE.setdefault(url, None)
 
             # For curated titles from llms.txt, we already have the title
             display_title = text_processor.normalize(title)
             index_title = text_processor.index_title_variants(display_title, url)
 
             # Index now with clean display title + hidden index variants; empty content for now
-            _INDEX.add(indexer.Doc(uri=url, display_title=display_title, content="", index_title=index_title))
+            doc = indexer.Doc(uri=url, display_title=display_title, content="", index_title=index_title)
+            _INDEX.add(doc)
+            _BM25.add(doc)
 
     _LINKS_LOADED = True
 
@@ -55,9 +181,28 @@ def ensure_ready() -> None:
         load_links_only()
 
 
+def _page_lock(url: str) -> threading.Lock:
+    """Get the lock guarding hydration of a URL.
+
+    URLs are mapped onto a fixed set of locks by hash: every thread hydrating
+    the same URL shares a lock, and unrelated URLs only occasionally do.
+    The lock is held for the whole fetch, including any wait for a per-host
+    request slot, so unrelated URLs that share a lock wait on each other's fetches.
+
+    Args:
+        url: The URL whose lock to return
+
+    Returns:
+        The lock shared by all threads hydrating this URL
+    """
+    return _PAGE_LOCKS[hash(url) % _PAGE_LOCK_STRIPES]
+
+
 def ensure_page(url: str) -> doc_fetcher.Page | None:
     """Ensure a page is cached, fetching it if necessary.
 
+    Thread-safe: concurrent calls for the same URL coalesce into a single fetch.
+
     Args:
         url: The URL of the page to ensure is cached
 
@@ -68,14 +213,88 @@ def ensure_page(url: str) -> doc_fetcher.Page | None:
     page = _URL_CACHE.get(url)
     if page is not None:
         return page
-    try:
-        raw = doc_fetcher.fetch_and_clean(url)
-        display_title = text_processor.format_display_title(url, raw.title, _URL_TITLES)
-        page = doc_fetcher.Page(url=url, title=display_title, content=raw.content)
-        _URL_CACHE[url] = page
-        return page
-    except Exception:
-        return None
+    with _page_lock(url):
+        # Another thread may have hydrated the page while we were waiting
+        page = _URL_CACHE.get(url)
+        if page is not None:
+            return page
+        try:
+            return _store_page(url, doc_fetcher.fetch_and_clean(url))
+        except Exception:
+            return None
+
+
+def _store_page(url: str, raw: doc_fetcher.Page) -> doc_fetcher.Page:
+    """Cache a freshly fetched page under its display title.
+
+    Args:
+        url: The URL the page was fetched from
+        raw: Page as returned by the fetcher
+
+    Returns:
+        The cached Page object
+    """
+    display_title = text_processor.format_display_title(url, raw.title, _URL_TITLES)
+    page = dataclasses.replace(raw, url=url, title=display_title)
+    _URL_CACHE.set(url, page)
+    # Feed the fetched content into the lexical index, reusing the page's tokens
+    with _BM25_LOCK:
+        doc = _BM25.get(url) if _BM25 is not None else None
+        if doc is not None:
+            _BM25.add(doc, page.tokens)
+    return page
+
+
+def ensure_pages(urls: List[str]) -> None:
+    """Hydrate several pages concurrently.
+
+    Page fetches are network-bound, so running them on a small thread pool turns
+    N sequential round-trips into roughly one.
+
+    Args:
+        urls: URLs of the pages to ensure are cached
+    """
+    if len(urls) <= 1:
+        for url in urls:
+            ensure_page(url)
+        return
+    with ThreadPoolExecutor(max_workers=min(HYDRATE_WORKERS_MAX, len(urls))) as executor:
+        list(executor.map(ensure_page, urls))
+
+
+def invalidate(url: str) -> None:
+    """Forget a cached page so the next access fetches it again.
+
+    Args:
+        url: The URL of the page to invalidate
+    """
+    with _page_lock(url):
+        _URL_CACHE.pop(url)
+        doc_fetcher.invalidate(url)
+
+
+def get_snippet(url: str, display_title: str) -> str:
+    """Get the search snippet for a page, memoized alongside the cached page.
+
+    Snippets only depend on the page content and title, so they are computed
+    once per fetched page instead of on every query. The memo lives in the page's
+    PageCache entry and is evicted, expired, or replaced together with the page.
+
+    Args:
+        url: The URL of the page
+        display_title: Title used for title-line detection and as fallback
+
+    Returns:
+        Snippet text, or the display title if the page is not cached
+    """
+    page = _URL_CACHE.get(url)
+    if page is None:
+        return text_processor.make_snippet(None, display_title)
+    snippet = _URL_CACHE.get_snippet(url, display_title)
+    if snippet is None:
+        snippet = text_processor.make_snippet(page, display_title)
+        _URL_CACHE.set_snippet(url, page, display_title, snippet)
+    return snippet
 
 
 def get_index() -> indexer.IndexSearch | None:
@@ -87,11 +306,20 @@ def get_index() -> indexer.IndexSearch | None:
     return _INDEX
 
 
-def get_url_cache() -> Dict[str, doc_fetcher.Page | None]:
-    """Get the URL cache dictionary.
+def get_bm25() -> indexer.BM25Index | None:
+    """Get the current BM25 lexical index instance.
+
+    Returns:
+        The initialized BM25Index instance, or None if not yet loaded
+    """
+    return _BM25
+
+
+def get_url_cache() -> PageCache:
+    """Get the URL cache.
 
     Returns:
-        Dictionary mapping URLs to cached Page objects (or None if not fetched)
+        PageCache mapping URLs to fetched Page objects
     """
     return _URL_CACHE
 
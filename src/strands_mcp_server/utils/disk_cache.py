@@ -0,0 +1,145 @@
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from ..config import doc_config
+
+_PICKLE_PROTOCOL = 5
+_ENTRY_VERSION = 2  # bump when the stored value layout changes so older entries are ignored
+_ENTRY_NAME = re.compile(r"^[0-9a-f]{64}(?:\.v(\d+))?\.pickle$")  # entry files of any layout version
+_TMP_MAX_AGE = 3600.0  # leftover temporary files older than this are removed
+_PRUNE_EVERY = 256  # stores between prunes after the initial one
+_prune_lock = threading.Lock()
+_stores_until_prune = 0  # 0 means the directory has not been pruned in this process yet
+
+
+def _path_for(url: str) -> Path:
+    """Map a URL to its cache file path.
+
+    Args:
+        url: The URL to map
+
+    Returns:
+        Path of the cache entry inside the configured cache directory
+    """
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return Path(doc_config.cache_dir).expanduser() / f"{digest}.v{_ENTRY_VERSION}.pickle"
+
+
+def load(url: str) -> Any | None:
+    """Load the cached entry for a URL.
+
+    Args:
+        url: The URL whose entry to load
+
+    Returns:
+        The stored value, or None if there is no usable entry
+
+    Note:
+        Missing, unreadable, or incompatible entries are all treated as misses.
+    """
+    try:
+        with open(_path_for(url), "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _prune(directory: Path) -> None:
+    """Keep the cache directory bounded.
+
+    Removes entries written by older layout versions, entries older than
+    doc_config.cache_max_age, and then the oldest entries beyond
+    doc_config.cache_max_entries. Leftover temporary files are removed too.
+    Files that do not look like cache entries are left alone.
+
+    Args:
+        directory: The cache directory
+    """
+    now = time.time()
+    entries: list[tuple[float, Path]] = []
+    try:
+        children = list(directory.iterdir())
+    except OSError:
+        return
+    for path in children:
+        try:
+            match = _ENTRY_NAME.match(path.name)
+            if match is None:
+                if path.suffix == ".tmp" and now - path.stat().st_mtime > _TMP_MAX_AGE:
+                    path.unlink(missing_ok=True)
+                continue
+            mtime = path.stat().st_mtime
+            if match.group(1) != str(_ENTRY_VERSION) or now - mtime > doc_config.cache_max_age:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((mtime, path))
+        except OSError:
+            continue
+
+    excess = len(entries) - doc_config.cache_max_entries
+    if excess > 0:
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+
+
+def _maybe_prune(directory: Path) -> None:
+    """Prune the cache directory on first use, then every _PRUNE_EVERY stores.
+
+    Args:
+        directory: The cache directory
+    """
+    global _stores_until_prune
+    with _prune_lock:
+        due = _stores_until_prune <= 0
+        _stores_until_prune = _PRUNE_EVERY if due else _stores_until_prune - 1
+    if due:
+        _prune(directory)
+
+
+def store(url: str, value: Any) -> None:
+    """Persist an entry for a URL.
+
+    The entry is written to a temporary file and moved into place, so readers
+    never observe a partially written entry. Failures are ignored since the
+    cache is only an optimization. The directory is pruned periodically so its
+    size stays bounded.
+
+    Args:
+        url: The URL the entry belongs to
+        value: Picklable value to store
+    """
+    path = _path_for(url)
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _maybe_prune(path.parent)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=_PICKLE_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
+
+def invalidate(url: str) -> None:
+    """Remove the cached entry for a URL, if any.
+
+    Args:
+        url: The URL whose entry to remove
+    """
+    try:
+        _path_for(url).unlink(missing_ok=True)
+    except OSError:
+        pass
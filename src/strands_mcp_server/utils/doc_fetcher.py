@@ -1,20 +1,60 @@
 import html
 import re
-import urllib.request
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import httpx
 
 from ..config import doc_config
+from . import disk_cache, indexer
 
 # Example: "[Quickstart](https://strandsagents.com/.../index.md)"
 _MD_LINK = re.compile(r"\[([^\]]+)\]\((https?://[^\)]+)\)")
-_HTML_BLOCK = re.compile(r"(?is)<(script|style|noscript).*?>.*?</\1>")
 _TAG = re.compile(r"(?s)<[^>]+>")
-_TITLE_TAG = re.compile(r"(?is)<title[^>]*>(.*?)</title>")
-_H1_TAG = re.compile(r"(?is)<h1[^>]*>(.*?)</h1>")
-_META_OG = re.compile(r'(?is)<meta[^>]+property=["\']og:title["\'][^>]+content=["\'](.*?)["\']')
+# One alternation for page cleanup. Named groups classify each match so the scan also yields title candidates:
+# script/style/noscript blocks (dropped with their bodies), the <title> element, og:title meta tags,
+# <h1> open/close tags, then comments and any other tag. Openers are scanned with [^>]* rather than .*?
+# so they can never run past their own '>'.
+_CLEAN = re.compile(
+    r"(?is)<(?P<block>script|style|noscript)\b[^>]*>.*?</(?P=block)\s*>"
+    r"|<title\b[^>]*>(?P<title>.*?)</title\s*>"
+    r"|<meta[^>]+property=[\"']og:title[\"'][^>]+content=[\"'](?P<og>[^>]*?)[\"'][^>]*>"
+    r"|(?P<h1><h1\b[^>]*>)"
+    r"|(?P<h1_end></h1\s*>)"
+    r"|<!--.*?-->"
+    r"|<[^>]+>"
+)
+_HTML_SNIFF = re.compile(r"(?i)<(?:html|head|body)\b")
+_HTML_SNIFF_BYTES = 1024  # HTML markers are expected within this many leading characters
+# Any '&' that does not start one of the common references below (bare '&' before whitespace/'<'/'&' is literal)
+_UNCOMMON_CHARREF = re.compile(r"&(?!(?:amp|lt|gt|quot|#39|nbsp);|[\t\n\f <&])")
+# Common references in replacement order; &amp; goes last so "&amp;lt;" becomes "&lt;", not "<"
+_COMMON_CHARREFS = (("&lt;", "<"), ("&gt;", ">"), ("&quot;", '"'), ("&#39;", "'"), ("&nbsp;", "\xa0"), ("&amp;", "&"))
+
+# Content types worth downloading; anything else (images, archives, ...) is refused before reading the body
+_TEXT_CONTENT_TYPES = ("text/", "application/xhtml+xml", "application/xml", "application/json")
+
+# Default headers sent with every request. Accept-Encoding is left to httpx: it advertises gzip/deflate,
+# plus br when the optional brotli extra is installed, and transparently decodes the response body.
+_HEADERS = {"User-Agent": doc_config.user_agent}
+
+# Shared client so repeated fetches reuse pooled keep-alive connections instead of
+# paying a TCP+TLS handshake per request. httpx.Client is safe to share across threads.
+_CLIENT = httpx.Client(
+    timeout=doc_config.timeout,
+    headers=_HEADERS,
+    limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    follow_redirects=True,
+)
 
+# Concurrency limits shared by every thread issuing requests, so parallel hydration cannot trip rate limits
+_REQUEST_SLOTS = threading.BoundedSemaphore(doc_config.max_concurrent_requests)
+_HOST_SLOTS: dict[str, threading.BoundedSemaphore] = {}  # host -> per-host request slots
+_HOST_SLOTS_GUARD = threading.Lock()
 
-@dataclass
+
+@dataclass(slots=True)
 class Page:
     """Represents a fetched and cleaned documentation page.
 
@@ -22,90 +62,230 @@ class Page:
         url: The source URL of the page
         title: Extracted or derived title of the page
         content: Cleaned text content of the page
+        tokens: Lowercase lexical tokens of the content, computed once at fetch time
     """
 
     url: str  # Source URL of the page
     title: str  # Page title (extracted or derived)
     content: str  # Cleaned text content
+    tokens: tuple[str, ...] = field(default=(), repr=False)  # Lexical tokens of content
+
 
+def _host_slots(url: str) -> threading.BoundedSemaphore:
+    """Get the semaphore limiting concurrent requests to the URL's host.
 
-def _get(url: str) -> str:
+    Args:
+        url: The URL about to be requested
+
+    Returns:
+        The semaphore shared by all requests to that host
+    """
+    host = urlsplit(url).netloc
+    with _HOST_SLOTS_GUARD:
+        slots = _HOST_SLOTS.get(host)
+        if slots is None:
+            slots = _HOST_SLOTS[host] = threading.BoundedSemaphore(doc_config.max_requests_per_host)
+        return slots
+
+
+def _get(url: str, headers: dict[str, str] | None = None) -> tuple[int, str, httpx.Headers, bool]:
     """Fetch content from a URL with proper headers and timeout.
 
+    The body is downloaded compressed when the server supports it, then
+    streamed and truncated at doc_config.max_response_bytes of decoded content,
+    so neither a misbehaving page nor a compression bomb can exhaust memory.
+    Requests wait for a free per-host and global slot before they are sent.
+
     Args:
         url: The URL to fetch
+        headers: Extra request headers (e.g. conditional request validators)
 
     Returns:
-        The decoded text content of the response
+        Tuple of (status code, decoded text content, response headers, truncated).
+        The content is empty for a 304 Not Modified response; truncated is True
+        when the body was cut off at the size limit.
 
     Raises:
-        urllib.error.URLError: If the request fails
+        httpx.HTTPError: If the request fails or returns an error status
+        ValueError: If the response is not a text content type
     """
-    req = urllib.request.Request(url, headers={"User-Agent": doc_config.user_agent})
-    with urllib.request.urlopen(req, timeout=doc_config.timeout) as r:
-        return r.read().decode("utf-8", errors="ignore")
+    with _host_slots(url), _REQUEST_SLOTS, _CLIENT.stream("GET", url, headers=headers) as response:
+        if response.status_code == 304:
+            return 304, "", response.headers, False
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "").lower()
+        if content_type and not content_type.startswith(_TEXT_CONTENT_TYPES):
+            raise ValueError(f"unsupported content type {content_type!r} for {url}")
 
+        limit = doc_config.max_response_bytes
+        buf = bytearray()
+        truncated = False
+        for chunk in response.iter_bytes():
+            buf += chunk
+            if len(buf) > limit:
+                del buf[limit:]
+                truncated = True
+                break
+        return response.status_code, buf.decode("utf-8", errors="ignore"), response.headers, truncated
 
-def parse_llms_txt(url: str) -> list[tuple[str, str]]:
+
+def parse_llms_txt(url: str) -> tuple[list[str], list[str]]:
     """Parse an llms.txt file and extract document links.
 
     Args:
         url: URL of the llms.txt file to parse
 
     Returns:
-        List of (title, url) tuples extracted from markdown links
+        Tuple of parallel (titles, urls) lists extracted from markdown links
 
     """
-    txt = _get(url)
-    return [
-        (match.group(1).strip() or match.group(2).strip(), match.group(2).strip()) for match in _MD_LINK.finditer(txt)
-    ]
+    _, txt, _, _ = _get(url)
+    titles: list[str] = []
+    urls: list[str] = []
+    for match in _MD_LINK.finditer(txt):
+        link = match.group(2).strip()
+        titles.append(match.group(1).strip() or link)
+        urls.append(link)
+    return titles, urls
+
 
+def _unescape(text: str) -> str:
+    """Unescape HTML character references.
 
-def _html_to_text(raw_html: str) -> str:
-    """Convert HTML to plain text using stdlib only.
+    Equivalent to html.unescape. When only the handful of references that make
+    up nearly all of them in documentation pages occur, they are replaced with
+    plain str.replace calls instead of html.unescape's per-reference callback.
+
+    Args:
+        text: Text that may contain character references
+
+    Returns:
+        Text with character references replaced
+    """
+    if "&" not in text:
+        return text
+    if _UNCOMMON_CHARREF.search(text):
+        return html.unescape(text)
+    for ref, char in _COMMON_CHARREFS:
+        text = text.replace(ref, char)
+    return text
+
+
+def _parse_html(raw_html: str) -> tuple[str | None, str]:
+    """Extract the title and plain text from HTML in a single scan.
+
+    Title candidates are collected from the named groups of the cleanup regex
+    as it walks the document, so the page is never searched separately for its title.
 
     Args:
         raw_html: Raw HTML content to convert
 
     Returns:
-        Plain text with HTML tags removed and entities unescaped
+        Tuple of (title, text). The title is taken from <title>, then og:title,
+        then the first <h1>, and is None if none is present. The text has tags
+        removed and entities unescaped.
 
     """
-    stripped = _HTML_BLOCK.sub("", raw_html)  # remove script/style
-    stripped = _TAG.sub(" ", stripped)  # drop tags
-    stripped = html.unescape(stripped)
+    title: str | None = None
+    og_title: str | None = None
+    h1_title: str | None = None
+    h1_start = -1
+
+    def _visit(match: re.Match[str]) -> str:
+        nonlocal title, og_title, h1_title, h1_start
+        kind = match.lastgroup
+        if kind == "title":
+            if title is None:
+                title = match.group("title")
+            return " " + match.group("title") + " "  # keep title text in the content
+        if kind == "og":
+            if og_title is None:
+                og_title = match.group("og")
+        elif kind == "h1":
+            if h1_start < 0:
+                h1_start = match.end()
+        elif kind == "h1_end":
+            if h1_start >= 0 and h1_title is None:
+                h1_title = _TAG.sub(" ", raw_html[h1_start : match.start()])
+        return " "
+
+    stripped = _unescape(_CLEAN.sub(_visit, raw_html))
     # normalize whitespace, remove empty lines
     lines = [ln.strip() for ln in stripped.splitlines()]
-    return "\n".join(ln for ln in lines if ln)
+    text = "\n".join(ln for ln in lines if ln)
+
+    for candidate in (title, og_title, h1_title):
+        if candidate is not None:
+            return _unescape(candidate).strip(), text
+    return None, text
 
 
-def _extract_html_title(raw_html: str) -> str | None:
-    """Extract title from HTML content using multiple strategies.
+def _fetch(page_url: str) -> tuple[Page | None, str, httpx.Headers, bool]:
+    """Download a page, revalidating any persisted copy (I/O stage).
 
     Args:
-        raw_html: Raw HTML content to extract title from
+        page_url: URL of the page to fetch
 
     Returns:
-        Extracted title string, or None if no title found
+        Tuple of (persisted Page if the server answered 304 else None, raw body, response headers,
+        whether the body was truncated)
+    """
+    cached = disk_cache.load(page_url)  # (etag, last_modified, Page) or None
+    conditional: dict[str, str] | None = None  # only allocated when there is something to revalidate
+    if cached is not None:
+        etag, last_modified, _ = cached
+        conditional = {}
+        if etag:
+            conditional["If-None-Match"] = etag
+        if last_modified:
+            conditional["If-Modified-Since"] = last_modified
+
+    status, raw, headers, truncated = _get(page_url, conditional)
+    if status == 304 and cached is not None:
+        return cached[2], "", headers, False
+    return None, raw, headers, truncated
+
+
+def _clean(page_url: str, raw: str) -> Page:
+    """Turn a downloaded body into a Page (CPU stage).
+
+    Args:
+        page_url: URL the body was downloaded from
+        raw: Raw response body
 
+    Returns:
+        Page object with URL, title, cleaned content, and tokens
     """
-    match = _TITLE_TAG.search(raw_html)
-    if match:
-        return html.unescape(match.group(1)).strip()
-    match = _META_OG.search(raw_html)
-    if match:
-        return html.unescape(match.group(1)).strip()
-    match = _H1_TAG.search(raw_html)
-    if match:
-        inner = _TAG.sub(" ", match.group(1))
-        return html.unescape(inner).strip()
-    return None
+    if _HTML_SNIFF.search(raw, 0, _HTML_SNIFF_BYTES):
+        extracted_title, content = _parse_html(raw)
+        title = extracted_title or page_url.rsplit("/", 1)[-1] or page_url
+    else:
+        title = page_url.rsplit("/", 1)[-1] or page_url
+        content = raw
+    return Page(url=page_url, title=title, content=content, tokens=tuple(indexer.tokenize(content)))
+
+
+def _persist(page_url: str, page: Page, headers: httpx.Headers) -> None:
+    """Persist a freshly cleaned page when the response carries validators.
+
+    Args:
+        page_url: URL of the page
+        page: The cleaned page
+        headers: Response headers holding ETag/Last-Modified
+    """
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if etag or last_modified:
+        disk_cache.store(page_url, (etag, last_modified, page))
 
 
 def fetch_and_clean(page_url: str) -> Page:
     """Fetch a web page and return cleaned content.
 
+    Pages are persisted on disk together with their ETag/Last-Modified
+    validators. A cached page is revalidated with a conditional request and
+    reused as-is when the server answers 304 Not Modified.
+
     Args:
         page_url: URL of the page to fetch
 
@@ -113,13 +293,19 @@ def fetch_and_clean(page_url: str) -> Page:
         Page object with URL, title, and cleaned content
 
     """
-    raw = _get(page_url)
-    lower = raw.lower()
-    if "<html" in lower or "<head" in lower or "<body" in lower:
-        extracted_title = _extract_html_title(raw)
-        content = _html_to_text(raw)
-        title = extracted_title or page_url.rsplit("/", 1)[-1] or page_url
-        return Page(url=page_url, title=title, content=content)
-    else:
-        title = page_url.rsplit("/", 1)[-1] or page_url
-        return Page(url=page_url, title=title, content=raw)
+    cached_page, raw, headers, truncated = _fetch(page_url)
+    if cached_page is not None:
+        return cached_page
+    page = _clean(page_url, raw)
+    if not truncated:  # a cut-off body must not be revalidated (and served) as if it were complete
+        _persist(page_url, page, headers)
+    return page
+
+
+def invalidate(page_url: str) -> None:
+    """Drop the persisted copy of a page so the next fetch downloads it in full.
+
+    Args:
+        page_url: URL of the page to invalidate
+    """
+    disk_cache.invalidate(page_url)
@@ -3,10 +3,11 @@ from __future__ import annotations
 import math
 import re
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 # Enhanced tokenization patterns
 _TOKEN = re.compile(r"[A-Za-z0-9_]+")
+_WORD = re.compile(r"\b\w+(?:'\w+)?\b")  # lexical (BM25) tokens, keeps contractions together
 _MD_HEADER = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
 _MD_CODE_BLOCK = re.compile(r"```[\w]*\n([\s\S]*?)```")
 _MD_INLINE_CODE = re.compile(r"`([^`]+)`")
@@ -30,12 +31,30 @@ class Doc:
     index_title: str  # Searchable title text including variants
 
 
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens for lexical scoring.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of lowercase tokens in document order
+    """
+    return _WORD.findall(text.lower())
+
+
 # Title boost constants
 _TITLE_BOOST_EMPTY = 8  # boost for unfetched content
 _TITLE_BOOST_SHORT = 5  # boost for short pages (<800 chars)
 _TITLE_BOOST_LONG = 3  # boost for longer pages
 _SHORT_PAGE_THRESHOLD = 800  # character threshold for short pages
 
+# BM25 / rank fusion constants
+_BM25_K1 = 0.9  # term frequency saturation
+_BM25_B = 0.4  # document length normalization
+_RRF_K = 10  # reciprocal rank fusion damping constant
+_RRF_WEIGHTS = (0.7, 0.3)  # weights of the TF-IDF and BM25 rankings
+
 
 class IndexSearch:
     """Lightweight inverted index with TF-IDF scoring and Markdown awareness.
@@ -203,3 +222,135 @@ class IndexSearch:
 
         ranked = sorted(((score, self.docs[i]) for i, score in scores.items()), key=lambda x: x[0], reverse=True)
         return ranked[:k]
+
+
+class BM25Index:
+    """Okapi BM25 lexical index over document titles and content.
+
+    Complements IndexSearch with a plain lexical channel so exact API names
+    rank well regardless of Markdown structure. Documents are keyed by URI;
+    adding a URI again replaces its previous entry.
+
+    Attributes:
+        docs: List of indexed documents
+        doc_lengths: Token count of each document
+        term_freqs: Per-document token frequencies
+        postings: Inverted index mapping tokens to document indices
+    """
+
+    def __init__(self, k1: float = _BM25_K1, b: float = _BM25_B) -> None:
+        """Initialize an empty BM25 index.
+
+        Args:
+            k1: Term frequency saturation parameter
+            b: Document length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self.docs: List[Doc] = []
+        self.doc_lengths: List[int] = []
+        self.term_freqs: List[Dict[str, int]] = []
+        self.postings: Dict[str, set[int]] = {}  # token -> doc indices
+        self._positions: Dict[str, int] = {}  # uri -> doc index
+        self._total_length = 0
+
+    def add(self, doc: Doc, content_tokens: Sequence[str] | None = None) -> None:
+        """Add or replace a document in the index.
+
+        Args:
+            doc: Document to index; its index_title is always tokenized
+            content_tokens: Pre-tokenized content (e.g. Page.tokens); doc.content is tokenized when omitted
+        """
+        tokens = tokenize(doc.index_title)
+        tokens.extend(tokenize(doc.content) if content_tokens is None else content_tokens)
+        freqs: Dict[str, int] = {}
+        for tok in tokens:
+            freqs[tok] = freqs.get(tok, 0) + 1
+
+        idx = self._positions.get(doc.uri)
+        if idx is None:
+            idx = len(self.docs)
+            self._positions[doc.uri] = idx
+            self.docs.append(doc)
+            self.doc_lengths.append(0)
+            self.term_freqs.append({})
+        else:
+            for tok in self.term_freqs[idx]:
+                self.postings[tok].discard(idx)
+            self.docs[idx] = doc
+
+        self._total_length += len(tokens) - self.doc_lengths[idx]
+        self.doc_lengths[idx] = len(tokens)
+        self.term_freqs[idx] = freqs
+        for tok in freqs:
+            self.postings.setdefault(tok, set()).add(idx)
+
+    def get(self, uri: str) -> Doc | None:
+        """Look up an indexed document by URI.
+
+        Args:
+            uri: URI of the document
+
+        Returns:
+            The indexed document, or None if the URI is not indexed
+        """
+        idx = self._positions.get(uri)
+        return None if idx is None else self.docs[idx]
+
+    def search(self, query: str, k: int = 8) -> List[Tuple[float, Doc]]:
+        """Score documents against a query with BM25.
+
+        Args:
+            query: Search query string
+            k: Maximum number of results to return
+
+        Returns:
+            List of (score, document) tuples sorted by relevance (highest first)
+        """
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_length = max(self._total_length / n_docs, 1.0)
+        scores: Dict[int, float] = {}
+
+        for qt in tokenize(query):
+            postings = self.postings.get(qt)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+            for idx in postings:
+                tf = self.term_freqs[idx][qt]
+                norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[idx] / avg_length)
+                scores[idx] = scores.get(idx, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        ranked = sorted(((score, self.docs[i]) for i, score in scores.items()), key=lambda x: x[0], reverse=True)
+        return ranked[:k]
+
+
+def fuse_rankings(
+    primary: List[Tuple[float, Doc]], secondary: List[Tuple[float, Doc]], k: int = 8
+) -> List[Tuple[float, Doc]]:
+    """Combine two rankings with weighted Reciprocal Rank Fusion.
+
+    Args:
+        primary: Ranked results from IndexSearch
+        secondary: Ranked results from BM25Index
+        k: Maximum number of results to return
+
+    Returns:
+        List of (fused score, document) tuples sorted by fused score (highest first)
+
+    Note:
+        Each document scores sum(weight / (_RRF_K + rank)) over the rankings it
+        appears in, with 1-based ranks. Documents are identified by URI.
+    """
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Doc] = {}
+    for weight, ranking in zip(_RRF_WEIGHTS, (primary, secondary), strict=True):
+        for rank, (_, doc) in enumerate(ranking, start=1):
+            scores[doc.uri] = scores.get(doc.uri, 0.0) + weight / (_RRF_K + rank)
+            docs.setdefault(doc.uri, doc)
+
+    ranked = sorted(((score, docs[uri]) for uri, score in scores.items()), key=lambda x: x[0], reverse=True)
+    return ranked[:k]